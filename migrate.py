@@ -4,90 +4,162 @@ https://github.com/harshavmb/sqlite3tomysql/commit/2f5f1f28add5d86a03b0ca3db92b5
 to use env variables. Also split up into atomic functions and removed MySQL clutter.
 """
 
+import contextlib
+import csv
+import functools
+import logging
+import queue
 import sqlite3
+import string
 import re  # For regular expressions to parse types
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from itertools import chain, islice
 from datetime import datetime
-from os import getenv
+from os import cpu_count, getenv, path, remove
 import sys
-from typing import Optional
 import mysql.connector
 
+logger = logging.getLogger(__name__)
+
 MARIADB_USER = getenv("MARIADB_USER", "kuma")  ## database user
 MARIADB_PASSWORD = getenv("MARIADB_PASSWORD", "secret")  ### password
-
-DB: dict[str, Optional[object]] = {
-    "sqlite_conn": None,
-    "mysql_conn": None,
-    "sqlite_cursor": None,
-    "mysql_cursor": None
-}
-
-# Mapping rules for SQLite -> MySQL types
-INTEGER_TYPES = {
-    "TINYINT": "TINYINT",
-    "SMALLINT": "SMALLINT",
-    "MEDIUMINT": "MEDIUMINT",
-    "BIGINT": "BIGINT UNSIGNED",
-    "INT": "INT UNSIGNED",  # fallback
-}
-
-NUMERIC_TYPES = (("REAL", "FLOA", "DOUB"), "DOUBLE"), \
-                (("NUM", "DEC"), "DECIMAL(10,2)"), \
-                (("BOOL",), "TINYINT(1)")
-
-TEXT_TYPES = ("CHAR", "CLOB", "TEXT")
-BLOB_TYPES = ("BLOB",)
+## number of tables migrated concurrently
+MIGRATION_WORKERS = int(getenv("MIGRATION_WORKERS", str(cpu_count() or 4)))
+
+# Mapping rules for SQLite -> MySQL types as (substring, mysql_type), first hit wins.
+# More specific substrings have to come before the ones they contain ("TINYINT" > "INT").
+INTEGER_TYPES = (
+    ("TINYINT", "TINYINT"),
+    ("SMALLINT", "SMALLINT"),
+    ("MEDIUMINT", "MEDIUMINT"),
+    ("BIGINT", "BIGINT UNSIGNED"),
+    ("INT", "INT UNSIGNED"),  # fallback
+)
+
+NUMERIC_TYPES = (
+    ("REAL", "DOUBLE"),
+    ("DOUB", "DOUBLE"),
+    ("FLOA", "DOUBLE"),
+    ("NUM", "DECIMAL(10,2)"),
+    ("DEC", "DECIMAL(10,2)"),
+    ("BOOL", "TINYINT(1)"),
+)
 
 INDEXED_VARCHAR_MAX = 191
 DEFAULT_VARCHAR_MAX = 255
-
-def map_integer_type(sqlite_type_upper: str) -> str | None:
+# Length of a type like VARCHAR(255)
+VARCHAR_LENGTH_RE = re.compile(r'\((\d+)\)')
+
+# Normalizes a default value in one pass: ASCII uppercase and " -> '
+DEFAULT_NORMALIZE = str.maketrans(
+    dict(zip(string.ascii_lowercase, string.ascii_uppercase), **{'"': "'"}))
+# Normalized defaults that mean "now"
+CURRENT_TIMESTAMP_DEFAULTS = frozenset({"CURRENT_TIMESTAMP", "'CURRENT_TIMESTAMP'"})
+
+# The SQLite database is only read: skip durability work, keep temp data in memory,
+# use a 256 MiB page cache and let the OS page cache serve the file via mmap
+SQLITE_READ_PRAGMAS = (
+    "PRAGMA query_only = ON;",
+    "PRAGMA synchronous = OFF;",
+    "PRAGMA temp_store = MEMORY;",
+    "PRAGMA cache_size = -262144;",
+    "PRAGMA mmap_size = 30000000000;",
+)
+# Only for databases opened immutable: a read-only WAL database can't change journal mode
+SQLITE_IMMUTABLE_PRAGMAS = (
+    "PRAGMA journal_mode = OFF;",
+)
+
+# Table names that have to be backticked in SQLite queries
+SQLITE_RESERVED_WORDS = frozenset({'group', 'order', 'key', 'index', 'table'})
+
+# Rows per INSERT batch and batches per MySQL transaction while copying data
+BATCH_SIZE = 1000
+COMMIT_EVERY_BATCHES = 50
+# Batches read ahead from SQLite while the previous ones are written to MySQL
+PREFETCH_BATCHES = 4
+# Upper bound for a single multi-row INSERT, further capped by max_allowed_packet
+MAX_INSERT_PACKET = 16 * 1024 * 1024
+# Placeholder limit of a single prepared statement
+MAX_PREPARED_PARAMS = 65535
+# Tables with at least this many rows are bulk loaded with LOAD DATA LOCAL INFILE
+LOAD_DATA_THRESHOLD = 10_000
+LOAD_DATA_ESCAPES = str.maketrans({
+    "\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r", "\0": "\\0"})
+
+
+@dataclass
+class TableSchema:
+    """ SQLite schema of one table, read once per table. """
+    columns: list  # PRAGMA table_info rows
+    col_names: tuple  # column names in the order of SELECT *
+    pk_col_names: set
+    unique_single_cols: set  # columns with a single-column UNIQUE index
+
+
+@dataclass(slots=True)
+class MigrationCtx:
+    """ Connections of one worker and a cursor on each for metadata and DDL. """
+    sqlite_conn: sqlite3.Connection
+    sqlite_cursor: sqlite3.Cursor
+    mysql_conn: mysql.connector.MySQLConnection
+    mysql_cursor: mysql.connector.cursor.MySQLCursor
+
+
+# All mappers take (sqlite_type_raw, sqlite_type_upper, is_primary_key, is_unique)
+# and return the MySQL type or None if they don't handle the SQLite type.
+
+def map_integer_type(_sqlite_type_raw: str, sqlite_type_upper: str, _is_primary_key: bool,
+                     _is_unique: bool) -> str | None:
     """Map integer-like types."""
-    for key, mysql_type in INTEGER_TYPES.items():
+    if "INT" not in sqlite_type_upper:
+        return None
+    for key, mysql_type in INTEGER_TYPES:
         if key in sqlite_type_upper:
             return mysql_type
     return None
 
-def map_numeric_type(sqlite_type_upper: str) -> str | None:
+def map_numeric_type(_sqlite_type_raw: str, sqlite_type_upper: str, _is_primary_key: bool,
+                     _is_unique: bool) -> str | None:
     """Map REAL/NUMERIC/BOOLEAN types."""
-    for keys, mysql_type in NUMERIC_TYPES:
-        if any(k in sqlite_type_upper for k in keys):
+    for key, mysql_type in NUMERIC_TYPES:
+        if key in sqlite_type_upper:
             return mysql_type
     return None
 
-def map_text_type(sqlite_type_raw: str, is_primary_key=False, is_unique=False) -> str | None:
+def map_text_type(sqlite_type_raw: str, sqlite_type_upper: str, is_primary_key: bool,
+                  is_unique: bool) -> str | None:
     """Map CHAR/TEXT/CLOB types."""
-    sqlite_type_upper = sqlite_type_raw.upper()
-    if not any(k in sqlite_type_upper for k in TEXT_TYPES):
+    if not ("CHAR" in sqlite_type_upper or "TEXT" in sqlite_type_upper
+            or "CLOB" in sqlite_type_upper):
         return None
 
     if is_primary_key or is_unique:
-        print(
-            f"Warning: Indexed text column '{sqlite_type_raw}' mapped to "
-            f"VARCHAR({INDEXED_VARCHAR_MAX}) for index compatibility.")
         return f"VARCHAR({INDEXED_VARCHAR_MAX})"
 
-    match = re.search(r'\((\d+)\)', sqlite_type_raw)
+    match = VARCHAR_LENGTH_RE.search(sqlite_type_raw)
     if match:
         length = int(match.group(1))
         return f"VARCHAR({min(length, DEFAULT_VARCHAR_MAX)})"
 
     return "LONGTEXT"
 
-def map_blob_type(sqlite_type_raw: str, is_primary_key=False, is_unique=False) -> str | None:
+def map_blob_type(_sqlite_type_raw: str, sqlite_type_upper: str, is_primary_key: bool,
+                  is_unique: bool) -> str | None:
     """Map BLOB types."""
-    if "BLOB" not in sqlite_type_raw.upper():
+    if "BLOB" not in sqlite_type_upper:
         return None
 
     if is_primary_key or is_unique:
-        print(
-            f"Warning: Indexed BLOB column '{sqlite_type_raw}' mapped to "
-            f"VARBINARY({INDEXED_VARCHAR_MAX}) for index compatibility.")
         return f"VARBINARY({INDEXED_VARCHAR_MAX})"
 
     return "BLOB"
 
-def map_datetime_type(sqlite_type_upper: str) -> str | None:
+def map_datetime_type(_sqlite_type_raw: str, sqlite_type_upper: str, _is_primary_key: bool,
+                      _is_unique: bool) -> str | None:
     """Handle DATE, DATETIME, TIME types."""
     if sqlite_type_upper == "TIME":
         return "TIME"
@@ -95,54 +167,124 @@ def map_datetime_type(sqlite_type_upper: str) -> str | None:
         return "DATETIME"
     return None
 
+# Mappers in order of priority
+MAPPERS = (
+    map_integer_type,
+    map_text_type,
+    map_blob_type,
+    map_numeric_type,
+    map_datetime_type,
+)
+
+@functools.lru_cache(maxsize=256)
 def map_sqlite_to_mysql_type(sqlite_type_raw, is_primary_key=False, is_unique=False):
     """
     Maps SQLite data types to MySQL types in a clean, maintainable way.
+    Cached, so it has no side effects: warnings are logged by map_column_type.
+    :return: MySQL type, or None if the SQLite type is unknown
     """
     sqlite_type_upper = sqlite_type_raw.upper()
 
-    # Try mapping in order of priority
-    for mapper in (
-        map_integer_type,
-        lambda t: map_text_type(sqlite_type_raw, is_primary_key, is_unique),
-        lambda t: map_blob_type(sqlite_type_raw, is_primary_key, is_unique),
-        map_numeric_type,
-        map_datetime_type
-    ):
-        mysql_type = mapper(sqlite_type_upper)
+    for mapper in MAPPERS:
+        mysql_type = mapper(sqlite_type_raw, sqlite_type_upper, is_primary_key, is_unique)
         if mysql_type:
             return mysql_type
+    return None
+
+
+def map_column_type(sqlite_type_raw, is_primary_key, is_unique):
+    """
+    Map the SQLite type of one column and log the warnings of the mapping, so
+    they show up for every affected column even though the mapping is cached.
+    """
+    mysql_type = map_sqlite_to_mysql_type(sqlite_type_raw, is_primary_key, is_unique)
+    if mysql_type is None:
+        logger.warning("Unknown SQLite type '%s'. Defaulting to VARCHAR(255).", sqlite_type_raw)
+        return "VARCHAR(255)"
 
-    print(f"Warning: Unknown SQLite type '{sqlite_type_raw}'. Defaulting to VARCHAR(255).")
-    return "VARCHAR(255)"
+    if is_primary_key or is_unique:
+        if mysql_type == f"VARCHAR({INDEXED_VARCHAR_MAX})":
+            logger.warning(
+                "Indexed text column '%s' mapped to VARCHAR(%d) for index compatibility.",
+                sqlite_type_raw, INDEXED_VARCHAR_MAX)
+        elif mysql_type == f"VARBINARY({INDEXED_VARCHAR_MAX})":
+            logger.warning(
+                "Indexed BLOB column '%s' mapped to VARBINARY(%d) for index compatibility.",
+                sqlite_type_raw, INDEXED_VARCHAR_MAX)
+    return mysql_type
+
+
+def connect_sqlite(sqlite_db_path):
+    """
+    Open the SQLite database read-only.
+    immutable=1 tells SQLite the file doesn't change while it's open (Kuma is stopped),
+    so no locks or change detection are needed. It also makes SQLite ignore the WAL
+    file, so a database with a -wal file left next to it (unclean shutdown, live
+    instance) is opened with mode=ro alone and read including the WAL content.
+    :raises sqlite3.Error: if the database can't be opened
+    """
+    pragmas = SQLITE_READ_PRAGMAS
+    uri = f"file:{sqlite_db_path}?mode=ro"
+    if not path.exists(f"{sqlite_db_path}-wal"):
+        uri += "&immutable=1"
+        pragmas += SQLITE_IMMUTABLE_PRAGMAS
+    # Rows are fetched by a reader thread, see fetch_batches
+    sqlite_conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    try:
+        for pragma in pragmas:
+            sqlite_conn.execute(pragma)
+    except sqlite3.Error:
+        sqlite_conn.close()
+        raise
+    return sqlite_conn
 
 
 def establish_db_connections(sqlite_db_path, mysql_config):
-    """ Establish DB connections, exit on error"""
+    """
+    Establish DB connections.
+    Every worker uses its own pair of connections. Errors are raised rather than
+    exiting, so a worker that can't connect fails like any other table.
+    :return: MigrationCtx
+    :raises sqlite3.Error, mysql.connector.Error: if a connection can't be opened
+    """
+    sqlite_conn = connect_sqlite(sqlite_db_path)
+
     try:
-        DB["sqlite_conn"] = sqlite3.connect(sqlite_db_path)
-        DB["sqlite_cursor"] = DB["sqlite_conn"].cursor()
-        print(f"Connected to SQLite database: {sqlite_db_path}")
-    except sqlite3.Error as e:
-        sys.exit(f"Error connecting to SQLite: {e}")
+        mysql_conn = mysql.connector.connect(**mysql_config)
+        # Transactions are managed explicitly while copying rows
+        mysql_conn.autocommit = False
+        mysql_cursor = mysql_conn.cursor()
+    except mysql.connector.Error:
+        sqlite_conn.close()
+        raise
 
     try:
-        DB["mysql_conn"] = mysql.connector.connect(**mysql_config)
-        DB["mysql_cursor"] = DB["mysql_conn"].cursor()
-        print("Connected to MySQL database: kumadb")
-    except mysql.connector.Error as e:
-        if DB["sqlite_cursor"]:
-            DB["sqlite_cursor"].close()
-        if DB["sqlite_conn"]:
-            DB["sqlite_conn"].close()
-        sys.exit(f"Error connecting to MySQL: {e}")
+        mysql_cursor.execute("SET FOREIGN_KEY_CHECKS = 0;")
+        mysql_conn.commit()
+    except mysql.connector.Error as err:
+        logger.error("Error disabling foreign key checks: %s", err)
+
+    try:
+        mysql_cursor.execute("SET SESSION bulk_insert_buffer_size = 268435456;")
+    except mysql.connector.Error as err:
+        logger.error("Error raising bulk insert buffer size: %s", err)
+
+    return MigrationCtx(sqlite_conn=sqlite_conn, sqlite_cursor=sqlite_conn.cursor(),
+                        mysql_conn=mysql_conn, mysql_cursor=mysql_cursor)
+
 
+def close_db_connections(ctx):
+    """ Re-enable foreign key checks and close both connections. """
     try:
-        DB["mysql_cursor"].execute("SET FOREIGN_KEY_CHECKS = 0;")
-        DB["mysql_conn"].commit()
-        print("Disabled MySQL foreign key checks.")
+        ctx.mysql_cursor.execute("SET FOREIGN_KEY_CHECKS = 1;")
+        ctx.mysql_conn.commit()
     except mysql.connector.Error as err:
-        print(f"Error disabling foreign key checks: {err}")
+        logger.error("Error re-enabling foreign key checks: %s", err)
+
+    ctx.mysql_cursor.close()
+    ctx.mysql_conn.close()
+    ctx.sqlite_cursor.close()
+    ctx.sqlite_conn.close()
 
 
 def build_default_sql(default_value, mysql_type, table_name, col_name):
@@ -150,47 +292,55 @@ def build_default_sql(default_value, mysql_type, table_name, col_name):
     Build a MySQL/MariaDB DEFAULT clause from a SQLite default value.
     Returns (default_sql, possibly_modified_mysql_type)
     """
+    default_sql, new_mysql_type = default_clause(default_value, mysql_type)
+    if new_mysql_type != mysql_type:
+        logger.warning(
+            "Default value %s for TINYINT column '%s.%s' exceeds range. "
+            "Promoting column to SMALLINT.", default_value, table_name, col_name)
+    return default_sql, new_mysql_type
+
+
+# typed: 1, 1.0 and True render differently
+@functools.lru_cache(maxsize=256, typed=True)
+def default_clause(default_value, mysql_type):
+    """
+    Cached core of build_default_sql, without side effects.
+    :return: (default_sql, mysql_type promoted to SMALLINT if the default overflows TINYINT)
+    """
 
     # 1) No default at all
     if default_value is None:
         return "", mysql_type
 
-    # Normalize string form once
-    default_str_raw = str(default_value)
-    default_str = default_str_raw.upper().replace('"', "'")
-
-    # 2) CURRENT_TIMESTAMP / DATETIME('now') handling
-    if (
-        default_str == "CURRENT_TIMESTAMP"
-        or default_str == "'CURRENT_TIMESTAMP'"
-        or "DATETIME('NOW')" in default_str
-    ):
-        # MariaDB supports DEFAULT CURRENT_TIMESTAMP for DATETIME,
-        # so we do NOT need to coerce to TIMESTAMP anymore.
-        return " DEFAULT CURRENT_TIMESTAMP", mysql_type
-
-    # 3) Explicit NULL defaults
-    if default_str in ("NULL", "'NULL'"):
-        return " DEFAULT NULL", mysql_type
-
-    # 4) Numeric defaults (int / float / numeric strings)
-    is_numeric = False
-    try:
-        numeric_value = float(default_value)
-        is_numeric = True
-    except (TypeError, ValueError):
-        pass
-
-    if is_numeric:
+    # Numbers need no normalization (bool is an int)
+    if isinstance(default_value, (int, float)):
+        numeric_value = default_value
+    else:
+        # Normalize string form once
+        default_str_raw = str(default_value)
+        default_str = default_str_raw.translate(DEFAULT_NORMALIZE)
+
+        # 2) CURRENT_TIMESTAMP / DATETIME('now') handling
+        if default_str in CURRENT_TIMESTAMP_DEFAULTS or "DATETIME('NOW')" in default_str:
+            # MariaDB supports DEFAULT CURRENT_TIMESTAMP for DATETIME,
+            # so we do NOT need to coerce to TIMESTAMP anymore.
+            return " DEFAULT CURRENT_TIMESTAMP", mysql_type
+
+        # 3) Explicit NULL defaults
+        if default_str in ("NULL", "'NULL'"):
+            return " DEFAULT NULL", mysql_type
+
+        # 4) Numeric strings
+        try:
+            numeric_value = float(default_str_raw)
+        except ValueError:
+            numeric_value = None
+
+    if numeric_value is not None:
         # Handle TINYINT overflow
         if "TINYINT" in mysql_type:
             # Signed TINYINT range: -128..127
             if numeric_value < -128 or numeric_value > 127:
-                print(
-                    f"Warning: Default value {default_value} for TINYINT column "
-                    f"'{table_name}.{col_name}' exceeds range. "
-                    f"Promoting column to SMALLINT."
-                )
                 mysql_type = mysql_type.replace("TINYINT", "SMALLINT")
 
         return f" DEFAULT {default_value}", mysql_type
@@ -219,9 +369,9 @@ def set_ai_nns(pk, mysql_type, not_null, col_name, table_name):
     if pk == 1 and ("INT" in mysql_type or "BIGINT" in mysql_type):
         auto_increment = " AUTO_INCREMENT"
         if not_null == 0:
-            print(
-                f"Warning: Primary key '{col_name}' in table '{table_name}' is NULLABLE\
-                 in SQLite. MySQL AUTO_INCREMENT implies NOT NULL.")
+            logger.warning(
+                "Primary key '%s' in table '%s' is NULLABLE in SQLite. "
+                "MySQL AUTO_INCREMENT implies NOT NULL.", col_name, table_name)
         not_null_sql = " NOT NULL"
     elif not_null == 1:
         not_null_sql = " NOT NULL"
@@ -230,39 +380,62 @@ def set_ai_nns(pk, mysql_type, not_null, col_name, table_name):
     return auto_increment, not_null_sql
 
 
-def process_columns(col, table_name, col_defs, pk_col_names, primary_keys):
+@functools.lru_cache(maxsize=None)
+def quote_sqlite_table(table_name):
+    """ Quote a table name for SQLite queries, backticking reserved keywords. """
+    if table_name.lower() in SQLITE_RESERVED_WORDS:
+        return f"`{table_name}`"
+    return f"'{table_name}'"
+
+
+def load_table_schema(ctx, table_name):
     """
-    Process column definitions.
-    :param col: The Column instance
+    Read columns, primary key and single-column UNIQUE indexes of a table.
+    :param ctx: MigrationCtx
     :param table_name: Name of the table
-    :param col_defs: Column definitions list from context
-    :param pk_col_names: Primary keys column names list from context
-    :param primary_keys: Primary Keys list from context
-    :return:
+    :return: TableSchema
     """
+    sqlite_cursor = ctx.sqlite_cursor
+    sqlite_cursor.execute(f"PRAGMA table_info({quote_sqlite_table(table_name)});")
+    columns = sqlite_cursor.fetchall()
 
-    # Determine if column has a UNIQUE constraint.
+    # Determine which columns have a UNIQUE constraint.
     # This simple check is for single-column UNIQUE.
     # For complex migrations, parsing CREATE statement is better.
-    is_unique_col = False
-    # Handle reserved keywords in SQLite queries
-    if table_name.lower() in {'group', 'order', 'key', 'index', 'table'}:
-        DB["sqlite_cursor"].execute(f"PRAGMA index_list(`{table_name}`);")
-    else:
-        DB["sqlite_cursor"].execute(f"PRAGMA index_list('{table_name}');")
-    indexes = DB["sqlite_cursor"].fetchall()
+    unique_single_cols = set()
+    sqlite_cursor.execute(f"PRAGMA index_list({quote_sqlite_table(table_name)});")
+    indexes = sqlite_cursor.fetchall()
     for idx in indexes:
         idx_name = idx[1]
         is_unique_idx = idx[2]  # 1 for unique, 0 for not
         if is_unique_idx == 1:
-            DB["sqlite_cursor"].execute(f"PRAGMA index_info('{idx_name}');")
-            idx_cols = DB["sqlite_cursor"].fetchall()
-            # Check if single column index and matches current column
-            if len(idx_cols) == 1 and idx_cols[0][2] == col[1]:
-                is_unique_col = True
-                break  # Found a unique index for this column
-
-    mysql_type = map_sqlite_to_mysql_type(
+            sqlite_cursor.execute(f"PRAGMA index_info('{idx_name}');")
+            idx_cols = sqlite_cursor.fetchall()
+            # Only a single column index makes the column itself unique
+            if len(idx_cols) == 1:
+                unique_single_cols.add(idx_cols[0][2])
+
+    return TableSchema(
+        columns=columns,
+        col_names=tuple(col[1] for col in columns),
+        pk_col_names={col[1] for col in columns if col[5] == 1},  # col[5] is 'pk'
+        unique_single_cols=unique_single_cols,
+    )
+
+
+def process_columns(col, table_name, col_defs, schema):
+    """
+    Process column definitions.
+    :param col: The Column instance
+    :param table_name: Name of the table
+    :param col_defs: Column definitions list from context
+    :param schema: TableSchema of the table
+    :return: UNIQUE index definition to add once the data is loaded, or None
+    """
+    pk_col_names = schema.pk_col_names
+    is_unique_col = col[1] in schema.unique_single_cols
+
+    mysql_type = map_column_type(
         col[2], # sqlite_type
         is_primary_key=(col[1] in pk_col_names),
         is_unique=is_unique_col  # Pass is_unique flag
@@ -273,133 +446,427 @@ def process_columns(col, table_name, col_defs, pk_col_names, primary_keys):
     # Handle default values. Special case for created_at/updated_at to manage in app.
     default_sql, mysql_type = build_default_sql(col[4], mysql_type, table_name, col[1])
 
-    col_defs.append(
-        f"`{col[1]}` {mysql_type}{not_null_sql}{default_sql}"
-        f"{auto_increment}".strip()
-    )
-    if col[5] == 1:  # primary key
-        primary_keys.append(f"`{col[1]}`")
+    # Clauses carry their own leading space and are only added when present
+    parts = ["`", col[1], "` ", mysql_type]
+    if not_null_sql:
+        parts.append(not_null_sql)
+    if default_sql:
+        parts.append(default_sql)
+    if auto_increment:
+        parts.append(auto_increment)
+    col_defs.append("".join(parts))
 
     # Add UNIQUE constraint if the column was found to be unique
     # Don't add UNIQUE if it's already PK (PK implies unique)
     if is_unique_col and col[1] not in pk_col_names:
-        col_defs.append(f"UNIQUE (`{col[1]}`)")
+        return f"UNIQUE (`{col[1]}`)"
+    return None
 
 
 def knex_timestamp_conversion(rows):
     """
-    Handle timestamp conversion for knex_migrations table
+    Handle timestamp conversion for knex_migrations table.
+    Rows are replaced in place, and only when their timestamp is converted.
     :param rows: list of tuples representing rows
     :return: same rows list but with converted timestamps
     """
-    processed_rows = []
-    for row_data in rows:
-        new_row = list(row_data)  # Convert tuple to list for modification
-        if len(new_row) >= 4:
-            # Convert Unix timestamp to MySQL DATETIME format
-            migration_time = new_row[3]  # migration_time column
-            if migration_time and str(migration_time).isdigit():
-                # Convert from milliseconds to seconds if needed
-                timestamp_val = int(migration_time)
-                if timestamp_val > 4000000000:  # If > year 2096, likely milliseconds
-                    timestamp_val = timestamp_val // 1000
+    for index, row_data in enumerate(rows):
+        if len(row_data) < 4:
+            continue
+
+        # Convert Unix timestamp to MySQL DATETIME format
+        migration_time = row_data[3]  # migration_time column
+        if isinstance(migration_time, int):
+            if migration_time <= 0:
+                continue
+            timestamp_val = migration_time
+        elif isinstance(migration_time, str) and migration_time.isdigit():
+            timestamp_val = int(migration_time)
+        else:
+            continue  # already formatted or NULL
 
-                try:
-                    dt = datetime.fromtimestamp(timestamp_val)
-                    new_row[3] = dt.strftime('%Y-%m-%d %H:%M:%S')
-                except (ValueError, OSError) as e:
-                    print(f"Warning: Could not convert timestamp {migration_time}: {e}")
-                    new_row[3] = None
+        # Convert from milliseconds to seconds if needed
+        if timestamp_val > 4000000000:  # If > year 2096, likely milliseconds
+            timestamp_val = timestamp_val // 1000
 
-        # Assume original 'created_at' and 'updated_at' are the last two columns.
-        # This is a simplification; a robust solution would use original_col_names.
-        processed_rows.append(tuple(new_row))
+        try:
+            converted = datetime.fromtimestamp(timestamp_val).strftime('%Y-%m-%d %H:%M:%S')
+        except (ValueError, OSError) as e:
+            logger.warning("Could not convert timestamp %s: %s", migration_time, e)
+            converted = None
+        rows[index] = row_data[:3] + (converted,) + row_data[4:]
 
-    return processed_rows
+    return rows
 
 
-def copy_rows(table_name, escaped_table_name):
+def get_insert_packet_limit(mysql_cursor):
     """
-    Copy rows from table name to escaped table name.
-    :param table_name: table name
-    :param escaped_table_name: backticked table name
+    Size budget for one multi-row INSERT statement in bytes.
+    Only half of the packet size is used to leave room for escaping and multibyte
+    characters which the row size estimate doesn't account for.
     """
-    rows = DB["sqlite_cursor"].fetchall()
-    if rows:
-        # Get column names to construct a proper INSERT statement
-        if table_name.lower() in {'group', 'order', 'key', 'index', 'table'}:
-            DB["sqlite_cursor"].execute(f"PRAGMA table_info(`{table_name}`);")
+    packet_limit = MAX_INSERT_PACKET
+    try:
+        mysql_cursor.execute("SELECT @@max_allowed_packet;")
+        packet_limit = min(packet_limit, int(mysql_cursor.fetchone()[0]))
+    except mysql.connector.Error as err:
+        logger.error("Error reading max_allowed_packet, assuming %d: %s", packet_limit, err)
+    return packet_limit // 2
+
+
+def estimate_row_size(row):
+    """ Rough size of a row's values once rendered into an INSERT statement. """
+    size = 0
+    for value in row:
+        if isinstance(value, (str, bytes)):
+            size += len(value) + 4  # quotes, separator and some escaping
+        else:
+            size += 24  # numbers and NULL
+    return size
+
+
+def split_batch(batch, packet_limit, params):
+    """
+    Split a batch into chunks that fit into one prepared INSERT statement: the
+    estimated size stays below packet_limit and the placeholders below
+    MAX_PREPARED_PARAMS.
+    The row values of a chunk are written flat into params, which is overwritten
+    in place for the next chunk, so it is only valid until the generator resumes.
+    :param batch: list of row tuples
+    :param packet_limit: size budget per INSERT statement
+    :param params: list reused as parameter buffer, e.g. one per table
+    :return: generator of the row count of each chunk, at least one row each
+    """
+    ncols = len(batch[0])
+    max_rows = max(1, MAX_PREPARED_PARAMS // ncols)
+    nrows = 0
+    pos = 0
+    chunk_size = 0
+    for row in batch:
+        row_size = estimate_row_size(row)
+        if nrows and (chunk_size + row_size > packet_limit or nrows == max_rows):
+            del params[pos:]
+            yield nrows
+            nrows = 0
+            pos = 0
+            chunk_size = 0
+        if pos < len(params):
+            # Same-length slice assignment replaces the values without reallocating
+            params[pos:pos + ncols] = row
         else:
-            DB["sqlite_cursor"].execute(f"PRAGMA table_info({table_name});")
-        original_col_names = [col[1] for col in DB["sqlite_cursor"].fetchall()]
-
-        # Adjust original_col_names and data based on MySQL's schema changes
-        # For api_key, if 'created_at' is managed by app, we need to pass a value.
-        # If 'updated_at' is auto-updated ON UPDATE, we can omit it on INSERT,
-        # but providing NOW() is also fine and explicit.
-        if table_name == "knex_migrations":
-            rows = knex_timestamp_conversion(rows)
-
-        placeholders = ','.join(['%s'] * len(original_col_names))
-        # Use INSERT IGNORE to skip duplicate key errors and continue processing
-        insert_stmt = (f"INSERT IGNORE INTO {escaped_table_name} "
-                       f"({','.join(f'`{col}`' for col in original_col_names)}) "
-                       f"VALUES ({placeholders})")
-        print(f"Copying {len(rows)} rows to `{table_name}` using: {insert_stmt}")
-
-        batch_size = 1000
-        successful_batches = 0
-        for i in range(0, len(rows), batch_size):
-            batch = rows[i:i + batch_size]
+            params.extend(row)
+        pos += ncols
+        nrows += 1
+        chunk_size += row_size
+    if nrows:
+        del params[pos:]
+        yield nrows
+
+
+def fetch_batches(table_name, select_cursor):
+    """
+    Stream rows from the SQLite cursor in batches of BATCH_SIZE rows.
+    A reader thread stays up to PREFETCH_BATCHES batches ahead, so SQLite reads
+    overlap with the MySQL writes of the consumer.
+    :param table_name: table name
+    :param select_cursor: SQLite cursor with a pending SELECT on the table
+    :return: generator of row lists
+    """
+    batch_queue = queue.Queue(maxsize=PREFETCH_BATCHES)
+    stop = threading.Event()
 
+    def put(item):
+        # Give up once the consumer is gone instead of blocking on a full queue
+        while not stop.is_set():
             try:
-                DB["mysql_cursor"].executemany(insert_stmt, batch)
-                DB["mysql_conn"].commit()
+                batch_queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def read_batches():
+        try:
+            while not stop.is_set():
+                batch = select_cursor.fetchmany(BATCH_SIZE)
+                if not batch:
+                    break
+
+                # Adjust data based on MySQL's schema changes
+                if table_name == "knex_migrations":
+                    batch = knex_timestamp_conversion(batch)
+                put(batch)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            put(err)  # re-raised in the consumer
+        finally:
+            put(None)
+
+    reader = threading.Thread(target=read_batches, name=f"read-{table_name}", daemon=True)
+    reader.start()
+    try:
+        while True:
+            batch = batch_queue.get()
+            if batch is None:
+                break
+            if isinstance(batch, Exception):
+                raise batch
+            yield batch
+    finally:
+        stop.set()
+        reader.join()
+
+
+@functools.lru_cache(maxsize=None)
+def insert_stmt_parts(table_name, col_names):
+    """
+    Statement prefix and the placeholder group of one row for multi-row INSERTs
+    into `table_name`, built once per table.
+    :param col_names: tuple of column names in the order of the row values
+    :return: (insert_prefix, row_placeholder)
+    """
+    # Use INSERT IGNORE to skip duplicate key errors and continue processing.
+    # Rows are sent as one multi-row INSERT per chunk instead of per-row statements.
+    insert_prefix = (f"INSERT IGNORE INTO `{table_name}` "
+                     f"({','.join(f'`{col}`' for col in col_names)}) "
+                     f"VALUES ")
+    return insert_prefix, f"({','.join(['%s'] * len(col_names))})"
+
+
+@functools.lru_cache(maxsize=64)
+def multi_row_insert_stmt(insert_prefix, row_placeholder, nrows):
+    """
+    INSERT statement for nrows rows.
+    Cached so equal statements are the identical str object: the prepared cursor
+    only skips re-preparing when it gets the same object again.
+    """
+    return insert_prefix + ','.join([row_placeholder] * nrows)
+
+
+def insert_batches(ctx, table_name, original_col_names, batches):
+    """
+    Insert batches with multi-row INSERT statements.
+    The statements are server-side prepared; full-size chunks all use the same
+    statement, so it is parsed once per table and rows are sent in binary form.
+    Batches share one transaction which is committed every COMMIT_EVERY_BATCHES
+    batches; a failing batch is rolled back to its savepoint.
+    :param ctx: MigrationCtx
+    :param table_name: table name
+    :param original_col_names: tuple of column names in the order of the row values
+    :param batches: iterable of row lists
+    """
+    stmt_parts = insert_stmt_parts(table_name, original_col_names)
+    logger.debug("Copying rows to `%s` using: %s%s,...", table_name, *stmt_parts)
+    mysql_cursor = ctx.mysql_cursor
+    packet_limit = get_insert_packet_limit(mysql_cursor)
+    # Parameter buffer filled in place by split_batch for every chunk of the table
+    params = []
+
+    batch_index = 0
+    successful_batches = 0
+    copied_rows = 0
+    prep_cursor = ctx.mysql_conn.cursor(prepared=True)
+    # Closing the cursor deallocates the server-side statement, also on errors
+    try:
+        mysql_cursor.execute("START TRANSACTION;")
+        for batch in batches:
+            mysql_cursor.execute("SAVEPOINT copy_batch;")
+            try:
+                for nrows in split_batch(batch, packet_limit, params):
+                    prep_cursor.execute(
+                        multi_row_insert_stmt(*stmt_parts, nrows), params)
                 successful_batches += 1
             except mysql.connector.Error as err:
-                print(
-                    f"Error inserting data into `{table_name}` "
-                    f"(batch {i // batch_size}, starting row {i}): {err}")
-                DB["mysql_conn"].rollback()
+                logger.error("Error inserting data into `%s` (batch %d, starting row %d): %s",
+                             table_name, batch_index, copied_rows, err)
+                mysql_cursor.execute("ROLLBACK TO SAVEPOINT copy_batch;")
                 # Continue with next batch instead of breaking
-                continue
+            batch_index += 1
+            copied_rows += len(batch)
+
+            # Cap the transaction (and redo log) size on very large tables
+            if batch_index % COMMIT_EVERY_BATCHES == 0:
+                ctx.mysql_conn.commit()
+                mysql_cursor.execute("START TRANSACTION;")
 
-        print(
-            f"Successfully processed {successful_batches} batches out of "
-            f"{(len(rows) + batch_size - 1) // batch_size} for table "
-            f"`{table_name}`")
-        print(f"Data copied to `{table_name}`.")
+        ctx.mysql_conn.commit()
+    finally:
+        prep_cursor.close()
+
+    if copied_rows:
+        logger.info("Successfully processed %d batches out of %d for table `%s`",
+                    successful_batches, batch_index, table_name)
+        logger.info("Data copied to `%s` (%d rows read).", table_name, copied_rows)
     else:
-        print(f"No data to copy for table `{table_name}`.")
+        logger.info("No data to copy for table `%s`.", table_name)
 
 
-def migrate_table(table_name):
-    """ Run migration for table `table_name`. """
-    if table_name == 'sqlite_sequence':
-        print(f"Skipping internal SQLite table: {table_name}")
-        return
-    if table_name.startswith('sqlite_autoindex_'):
-        print(f"Skipping internal SQLite autoindex table: {table_name}")
+def load_data_field(value):
+    """
+    Render a value for LOAD DATA with MySQL's default escaping.
+    NULL becomes \\N; backslash, tab, newline, carriage return and NUL are
+    backslash-escaped.
+    """
+    if value is None:
+        return "\\N"
+    if isinstance(value, bytes):
+        # Written back as the original bytes through the surrogateescape handler
+        value = value.decode("utf-8", "surrogateescape")
+    if isinstance(value, str):
+        return value.translate(LOAD_DATA_ESCAPES)
+    return value
+
+
+def load_data_infile(ctx, table_name, original_col_names, batches):
+    """
+    Write batches to a temporary tab separated file and bulk load it with
+    LOAD DATA LOCAL INFILE.
+    :param ctx: MigrationCtx
+    :param table_name: table name
+    :param original_col_names: column names in the order of the row values
+    :param batches: iterable of row lists
+    :return: True if the data was loaded, False if the load failed and was rolled back
+    """
+    copied_rows = 0
+    data_path = None
+    # The file holds a full dump of the table: remove it however writing or loading ends
+    try:
+        with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", errors="surrogateescape", newline="",
+                prefix=f"{table_name}-", suffix=".tsv", delete=False) as data_file:
+            data_path = data_file.name
+            writer = csv.writer(data_file, delimiter="\t", quoting=csv.QUOTE_NONE,
+                                quotechar=None, escapechar=None, lineterminator="\n")
+            for batch in batches:
+                writer.writerows([load_data_field(value) for value in row] for row in batch)
+                copied_rows += len(batch)
+
+        load_stmt = (f"LOAD DATA LOCAL INFILE %s IGNORE INTO TABLE `{table_name}` "
+                     f"CHARACTER SET utf8mb4 FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+                     f"LINES TERMINATED BY '\\n' "
+                     f"({','.join(f'`{col}`' for col in original_col_names)})")
+        logger.info("Loading %d rows into `%s` with LOAD DATA.", copied_rows, table_name)
+        logger.debug("LOAD DATA statement: %s", load_stmt)
+        try:
+            ctx.mysql_cursor.execute("START TRANSACTION;")
+            ctx.mysql_cursor.execute(load_stmt, (data_path,))
+            ctx.mysql_conn.commit()
+        except mysql.connector.Error as err:
+            logger.error("Error loading data into `%s`: %s", table_name, err)
+            ctx.mysql_conn.rollback()
+            return False
+    finally:
+        if data_path:
+            remove(data_path)
+
+    logger.info("Data copied to `%s` (%d rows read).", table_name, copied_rows)
+    return True
+
+
+def copy_rows(ctx, table_name, select_cursor, schema, bulk_load=False):
+    """
+    Copy the rows of the pending SELECT into MySQL table `table_name`.
+    Rows are streamed from the SQLite cursor in batches so that only one batch is
+    held in memory at a time. With bulk_load, tables of at least LOAD_DATA_THRESHOLD
+    rows are loaded via LOAD DATA LOCAL INFILE, smaller ones via multi-row INSERTs.
+    :param ctx: MigrationCtx
+    :param table_name: table name
+    :param select_cursor: SQLite cursor with a pending SELECT on the table
+    :param schema: TableSchema of the table
+    :param bulk_load: whether the table may be loaded with LOAD DATA
+    :return: False if the bulk load failed and the rows have to be copied again
+    """
+    # Closing the generator stops and joins the reader thread before the caller
+    # closes select_cursor, also when the copy raises
+    with contextlib.closing(fetch_batches(table_name, select_cursor)) as fetched:
+        batches = fetched
+        if bulk_load:
+            head = list(islice(fetched, -(-LOAD_DATA_THRESHOLD // BATCH_SIZE)))
+            batches = chain(head, fetched)
+            if sum(len(batch) for batch in head) >= LOAD_DATA_THRESHOLD:
+                return load_data_infile(ctx, table_name, schema.col_names, batches)
+
+        insert_batches(ctx, table_name, schema.col_names, batches)
+    return True
+
+
+def copy_table_data(ctx, table_name, schema):
+    """
+    Copy all rows of table `table_name` into the freshly created MySQL table.
+    :param ctx: MigrationCtx
+    :param table_name: table name
+    :param schema: TableSchema of the table
+    """
+    # Binary data is kept out of the text file used by LOAD DATA
+    bulk_load = not any("BLOB" in col[2].upper() for col in schema.columns)
+
+    # Stream on a dedicated cursor so metadata queries cannot reset the pending SELECT
+    select_cursor = ctx.sqlite_conn.cursor()
+    try:
+        select_stmt = f"SELECT * FROM {quote_sqlite_table(table_name)}"
+        select_cursor.execute(select_stmt)
+        if not copy_rows(ctx, table_name, select_cursor, schema, bulk_load):
+            logger.warning("Falling back to INSERT statements for table `%s`.", table_name)
+            select_cursor.execute(select_stmt)
+            copy_rows(ctx, table_name, select_cursor, schema)
+    finally:
+        select_cursor.close()
+
+
+def add_post_load_indexes(ctx, table_name, post_load_indexes):
+    """
+    Add the indexes deferred during table creation in a single ALTER TABLE.
+    ALTER IGNORE (MariaDB) drops rows that violate a UNIQUE index, matching what
+    INSERT IGNORE did while the index existed during the copy.
+    :param ctx: MigrationCtx
+    :param table_name: table name
+    :param post_load_indexes: index definitions, e.g. "UNIQUE (`col`)"
+    """
+    if not post_load_indexes:
         return
 
-    print(f"\nProcessing table: `{table_name}`")
+    alter_stmt = (f"ALTER IGNORE TABLE `{table_name}` "
+                  f"{', '.join(f'ADD {index}' for index in post_load_indexes)};")
+    logger.info("Adding indexes to `%s`.", table_name)
+    logger.debug("ALTER TABLE statement: %s", alter_stmt)
+    try:
+        ctx.mysql_cursor.execute(alter_stmt)
+    except mysql.connector.Error as err:
+        logger.error("Error adding indexes to `%s`: %s", table_name, err)
+
+
+def create_mysql_table(ctx, table_name, create_stmt):
+    """
+    (Re)create table `table_name` in MySQL.
+    DROP and CREATE are sent as one multi-statement query, a single round trip.
+    Needs mysql-connector-python 9.2+, older versions require execute(..., multi=True).
+    :return: True if the table was created
+    """
+    mysql_cursor = ctx.mysql_cursor
+    try:
+        mysql_cursor.execute(f"DROP TABLE IF EXISTS `{table_name}`;\n{create_stmt}")
+        # Errors of the CREATE are raised while reading its result
+        while mysql_cursor.nextset():
+            pass
+        logger.info("Table `%s` created in MySQL.", table_name)
+    except mysql.connector.Error as err:
+        logger.error("Error creating table `%s`: %s", table_name, err)
+        return False
+    return True
+
+
+def migrate_table(ctx, table_name):
+    """ Run migration for table `table_name`. """
+    logger.info("Processing table: `%s`", table_name)
 
     escaped_table_name = f"`{table_name}`"  # Escape table name for safety
 
-    # Handle reserved keywords in SQLite queries too
-    if table_name.lower() in {'group', 'order', 'key', 'index', 'table'}:
-        DB["sqlite_cursor"].execute(f"PRAGMA table_info(`{table_name}`);")
-    else:
-        DB["sqlite_cursor"].execute(f"PRAGMA table_info({table_name});")
-    columns = DB["sqlite_cursor"].fetchall()
+    # Schema is read once; column processing and the data copy reuse it
+    schema = load_table_schema(ctx, table_name)
     col_defs = []
-    primary_keys = []
+    # Secondary indexes are created after the data is loaded, so inserts only
+    # maintain the primary key
+    post_load_indexes = []
     # unique_constraints = {}  # Stores {col_name: unique_group_name} if composite unique
 
-    # Determine primary keys and unique columns for accurate type mapping and constraint
-    # generation
-    pk_col_names = {col[1] for col in columns if col[5] == 1}  # col[5] is 'pk'
-
     # Additional logic: Check for UNIQUE constraints from sqlite_master
     # (if relevant for other tables)
     # For simplicity for 'api_key' example, we'll assume UNIQUE means single-column unique
@@ -413,9 +880,12 @@ def migrate_table(table_name):
     # For now, if a column is explicitly marked UNIQUE in the SQLite DDL, this will handle
     # it. The provided api_key DDL indicates client_name and key_hash are UNIQUE.
 
-    for col in columns:
-        process_columns(col, table_name, col_defs, pk_col_names, primary_keys)
+    for col in schema.columns:
+        index_def = process_columns(col, table_name, col_defs, schema)
+        if index_def:
+            post_load_indexes.append(index_def)
 
+    primary_keys = [f"`{col[1]}`" for col in schema.columns if col[5] == 1]
     if primary_keys:
         col_defs.append(f"PRIMARY KEY ({', '.join(primary_keys)})")
 
@@ -435,61 +905,73 @@ def migrate_table(table_name):
                    f"    {joined_col_defs}\n) "
                    f"ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;")
 
-    print(f"Generated CREATE TABLE statement:\n{create_stmt}")
+    logger.debug("Generated CREATE TABLE statement:\n%s", create_stmt)
 
-    try:
-        DB["mysql_cursor"].execute(f"DROP TABLE IF EXISTS {escaped_table_name};")
-        DB["mysql_cursor"].execute(create_stmt)
-        print(f"Table `{table_name}` created in MySQL.")
-    except mysql.connector.Error as err:
-        print(f"Error creating table `{table_name}`: {err}")
+    if not create_mysql_table(ctx, table_name, create_stmt):
         return
 
-    # Handle reserved keywords in SQLite SELECT queries
-    if table_name.lower() in {'group', 'order', 'key', 'index', 'table'}:
-        DB["sqlite_cursor"].execute(f"SELECT * FROM `{table_name}`")
-    else:
-        DB["sqlite_cursor"].execute(f"SELECT * FROM {table_name}")
-    copy_rows(table_name, escaped_table_name)
+    copy_table_data(ctx, table_name, schema)
 
+    add_post_load_indexes(ctx, table_name, post_load_indexes)
 
-def migrate_sqlite_to_mysql(sqlite_db_path, mysql_config):
-    """
-    Migrates a SQLite database to MySQL, including table schemas and data.
-    """
-    establish_db_connections(sqlite_db_path,mysql_config)
 
+def migrate_table_worker(sqlite_db_path, mysql_config, table_name):
+    """ Migrate table `table_name` on a dedicated pair of connections. """
+    ctx = establish_db_connections(sqlite_db_path, mysql_config)
     try:
-        DB["sqlite_cursor"].execute("SELECT name FROM sqlite_master WHERE type='table';")
-        tables = DB["sqlite_cursor"].fetchall()
-        print(f"Found tables in SQLite: {[t[0] for t in tables]}")
-
-        for table_name_tuple in tables:
-            migrate_table(table_name_tuple[0])  # table_name_tuple[0] is the table name
-    # pylint: disable=broad-exception-caught
-    except Exception as e:
-        print(f"An unexpected error occurred during migration: {e}")
-        if DB["mysql_conn"]:
-            DB["mysql_conn"].rollback()
+        migrate_table(ctx, table_name)
+    except Exception:
+        ctx.mysql_conn.rollback()
+        raise
+    finally:
+        close_db_connections(ctx)
 
+
+def list_tables(sqlite_db_path):
+    """
+    List the tables of the SQLite database, largest first so the longest copy
+    starts as early as possible. SQLite's internal sqlite_* tables are left out.
+    :return: table names ordered by descending row count
+    """
+    try:
+        sqlite_conn = connect_sqlite(sqlite_db_path)
+    except sqlite3.Error as e:
+        sys.exit(f"Error connecting to SQLite: {e}")
+    logger.info("Connected to SQLite database: %s", sqlite_db_path)
+    try:
+        sqlite_cursor = sqlite_conn.cursor()
+        sqlite_cursor.execute("SELECT name FROM sqlite_master WHERE type='table' "
+                              "AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\';")
+        table_sizes = {}
+        for (table_name,) in sqlite_cursor.fetchall():
+            sqlite_cursor.execute(f"SELECT COUNT(*) FROM {quote_sqlite_table(table_name)};")
+            table_sizes[table_name] = sqlite_cursor.fetchone()[0]
+        sqlite_cursor.close()
     finally:
-        if DB["mysql_cursor"] and DB["mysql_conn"]:
-            try:
-                DB["mysql_cursor"].execute("SET FOREIGN_KEY_CHECKS = 1;")
-                DB["mysql_conn"].commit()
-                print("\nForeign key checks re-enabled in MySQL.")
-            except mysql.connector.Error as err:
-                print(f"Error re-enabling foreign key checks: {err}")
+        sqlite_conn.close()
+    return sorted(table_sizes, key=table_sizes.get, reverse=True)
+
 
-        if DB["mysql_cursor"]:
-            DB["mysql_cursor"].close()
-        if DB["mysql_conn"]:
-            DB["mysql_conn"].close()
-        if DB["sqlite_cursor"]:
-            DB["sqlite_cursor"].close()
-        if DB["sqlite_conn"]:
-            DB["sqlite_conn"].close()
-        print("Database connections closed.")
+def migrate_sqlite_to_mysql(sqlite_db_path, mysql_config):
+    """
+    Migrates a SQLite database to MySQL, including table schemas and data.
+    Tables are migrated concurrently by MIGRATION_WORKERS threads.
+    """
+    tables = list_tables(sqlite_db_path)
+    logger.info("Found tables in SQLite: %s", tables)
+
+    with ThreadPoolExecutor(max_workers=MIGRATION_WORKERS) as executor:
+        futures = {
+            executor.submit(migrate_table_worker, sqlite_db_path, mysql_config, table_name):
+                table_name
+            for table_name in tables
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.error("An unexpected error occurred while migrating `%s`: %s",
+                             futures[future], e)
 
 
 # --- Configuration ---
@@ -498,9 +980,14 @@ mysql_connection_config = {
     'host': "localhost",  ## change to remote mysql host
     'user': MARIADB_USER,  ## database user
     'password': MARIADB_PASSWORD,  ### password
-    'database': "kumadb"  ## database name
+    'database': "kumadb",  ## database name
+    'allow_local_infile': True  ## needed for LOAD DATA LOCAL INFILE
 }
 
 # --- Run the migration ---
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=getenv("LOG_LEVEL", "INFO").upper(),
+        format="%(asctime)s %(levelname)s %(message)s",
+        handlers=[logging.StreamHandler(sys.stderr)])
     migrate_sqlite_to_mysql(SQLITE_DB, mysql_connection_config)